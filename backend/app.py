@@ -2,13 +2,29 @@ import json
 import os
 import random
 import shutil
+import threading
+import time
+from contextlib import contextmanager
 from datetime import date
 from uuid import UUID, uuid4
 
+try:
+    import fcntl
+except ImportError:  # Windows has msvcrt instead
+    fcntl = None
+    import msvcrt
+
 from flask import Flask, current_app, jsonify, request, send_from_directory
 import click
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from werkzeug.utils import secure_filename
 
+from compression import PrecompressedPayload, init_compression
+from events import init_events, publish_change
+from idempotency import init_idempotency
+from jobs import enqueue_job, init_jobs, job_handler, run_pending_jobs
 from models import (
     Author,
     Country,
@@ -35,8 +51,75 @@ SORT_FIELDS = {
     "created_at": Species.created_at,
 }
 
+SPECIES_INCLUDES = {"taxonomy", "images", "authors", "distributions"}
+DEFAULT_SPECIES_INCLUDES = frozenset({"taxonomy", "images", "authors"})
+INVALID_INCLUDE_MESSAGE = (
+    "Invalid include value: use taxonomy, images, authors, distributions "
+    "(authors requires images)"
+)
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+ID_BATCH_SIZE = 500
+
+# Serialized species lists keyed by (sort, order, includes); cleared locally on
+# writes and expired after LIST_CACHE_TTL so other worker processes pick up
+# changes too
+LIST_CACHE_SIZE = 64
+_list_cache = {}
+_list_cache_lock = threading.Lock()
+_list_cache_generation = 0
+
+# Default image targets already copied into an upload folder by this process
+_default_image_copied = set()
+
+# Author ids keyed by normalized email (or by name when there is no email)
+_author_cache = {}
+_author_cache_lock = threading.Lock()
+AUTHOR_CACHE_SIZE = 1024
+
+# Countries are a small reference table; each worker keeps them in memory,
+# reloading after COUNTRY_CACHE_TTL or when a count refresh finishes here
+_country_cache = {"expires_at": 0.0, "countries": {}}
+_country_cache_lock = threading.Lock()
+
+# Indexes added after the first release; create_all only adds them to new tables
+UPGRADE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_species_common_name_id "
+    "ON species (common_name, species_id)",
+    "CREATE INDEX IF NOT EXISTS ix_author_author_name ON author (author_name)",
+    "CREATE INDEX IF NOT EXISTS ix_image_species_id ON image (species_id)",
+    "CREATE INDEX IF NOT EXISTS ix_distribution_species_id ON distribution (species_id)",
+    "CREATE INDEX IF NOT EXISTS ix_distribution_country_id ON distribution (country_id)",
+    "CREATE INDEX IF NOT EXISTS ix_modification_species_id "
+    "ON modification (species_id)",
+]
+
+SEED_COUNTRIES = [
+    ("Kenya", "Africa", 0.0236, 37.9062),
+    ("Tanzania", "Africa", -6.369, 34.8888),
+    ("South Africa", "Africa", -30.5595, 22.9375),
+    ("France", "Europe", 46.2276, 2.2137),
+    ("Spain", "Europe", 40.4637, -3.7492),
+    ("Germany", "Europe", 51.1657, 10.4515),
+    ("Norway", "Europe", 60.472, 8.4689),
+    ("United Kingdom", "Europe", 55.3781, -3.436),
+    ("United States", "Americas", 37.0902, -95.7129),
+    ("Canada", "Americas", 56.1304, -106.3468),
+    ("Brazil", "Americas", -14.235, -51.9253),
+    ("Peru", "Americas", -9.19, -75.0152),
+    ("Argentina", "Americas", -38.4161, -63.6167),
+    ("Mexico", "Americas", 23.6345, -102.5528),
+    ("India", "Asia", 20.5937, 78.9629),
+    ("China", "Asia", 35.8617, 104.1954),
+    ("Japan", "Asia", 36.2048, 138.2529),
+    ("Indonesia", "Asia", -0.7893, 113.9213),
+    ("Australia", "Oceania", -25.2744, 133.7751),
+    ("New Zealand", "Oceania", -40.9006, 174.886),
+]
+
 
 def create_app():
+    init_started = time.perf_counter()
     app = Flask(__name__)
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv(
         "DATABASE_URL", "sqlite:///ornithology.db"
@@ -45,6 +128,8 @@ def create_app():
     app.config["UPLOAD_FOLDER"] = os.getenv("UPLOAD_FOLDER", "uploads")
     app.config["MAX_CONTENT_LENGTH"] = 15 * 1024 * 1024
     app.config["DEFAULT_IMAGE_FILENAME"] = os.getenv("DEFAULT_IMAGE_FILENAME", "base_fill.png")
+    app.config["LIST_CACHE_TTL"] = float(os.getenv("LIST_CACHE_TTL", "10"))
+    app.config["COUNTRY_CACHE_TTL"] = float(os.getenv("COUNTRY_CACHE_TTL", "300"))
     app.config["DEFAULT_IMAGE_SOURCE"] = os.path.abspath(
         os.path.join(
             app.root_path, "..", "frontend", "bird_app", "assets", "base_fill.png"
@@ -54,13 +139,20 @@ def create_app():
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
     db.init_app(app)
+    init_jobs(app)
+    init_compression(app)
+    init_events(app)
+    # Registered after compression so responses are stored before being encoded
+    init_idempotency(app)
 
     @app.after_request
     def add_cors_headers(response):
         response.headers["Access-Control-Allow-Origin"] = os.getenv(
             "CORS_ORIGIN", "*"
         )
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+        response.headers["Access-Control-Allow-Headers"] = (
+            "Content-Type, Authorization, Idempotency-Key"
+        )
         response.headers["Access-Control-Allow-Methods"] = (
             "GET, POST, PUT, DELETE"
         )
@@ -79,16 +171,30 @@ def create_app():
         with app.app_context():
             db.create_all()
             seeded = _seed_fake_data(count)
+            # CLI processes run no worker pool, so finish queued work before exiting
+            run_pending_jobs()
             if seeded:
                 print(f"Seeded database with {count} entries per table.")
             else:
                 print("Database already contains data. Skipping seed.")
 
-    if os.getenv("SEED_ON_STARTUP") == "1":
+    @app.cli.command("upgrade-db")
+    def upgrade_db():
+        """Bring a database created by an earlier version to the current schema."""
         with app.app_context():
             db.create_all()
-            _seed_fake_data(30)
+            removed, removed_authors = _upgrade_schema()
+            run_pending_jobs()
+            print(
+                f"Database upgraded. Merged {removed} duplicate countries "
+                f"and {removed_authors} duplicate authors."
+            )
 
+    seed_seconds = None
+    if os.getenv("SEED_ON_STARTUP") == "1":
+        seed_started = time.perf_counter()
+        _seed_once(app)
+        seed_seconds = time.perf_counter() - seed_started
 
     # Define API routes
     @app.route("/", methods=["GET"])
@@ -103,9 +209,15 @@ def create_app():
                 "/api/docs [GET]": "API documentation and endpoint listing.",
                 "/api/species [POST]": "Create a new species entry.",
                 "/api/species [GET]": "List all species with optional sorting.",
+                "/api/species?ids=<id,id,...>&include=<taxonomy,images,authors,distributions> [GET]": "Fetch several species at once with only the requested relations.",
+                "/api/species/index [GET]": "List species ids and common names for pickers.",
+                "/api/countries [GET]": "List countries with their species counts.",
+                "/api/events [GET]": "Server-Sent Events stream of species changes.",
+                "/api/countries/<country_id>/species [GET]": "List species distributed in a country.",
                 "/api/species/<species_id> [GET]": "Get details of a specific species.",
                 "/api/species/<species_id> [PUT]": "Update an existing species entry.",
-                "/api/species/<species_id> [DELETE]": "Delete a species entry."
+                "/api/species/<species_id> [DELETE]": "Delete a species entry.",
+                "/api/species?ids=<id,id,...> [DELETE]": "Delete several species entries at once."
             },
             "description": "This API allows you to manage ornithological species data, including taxonomy, images, and distribution information."
         })
@@ -157,18 +269,52 @@ def create_app():
             )
 
         db.session.commit()
+        _invalidate_list_cache()
+        publish_change(species.species_id, "created")
         return jsonify(_serialize_species(species)), 201
 
+    @app.route("/api/species/index", methods=["GET"])
+    def species_index():
+        cache_key = ("index",)
+        payload = _get_cached_list(cache_key)
+        if payload is None:
+            generation = _list_cache_generation
+            # Served entirely from ix_species_common_name_id without touching the table
+            rows = db.session.query(Species.species_id, Species.common_name).order_by(
+                Species.common_name
+            )
+            payload = PrecompressedPayload(
+                app.json.dumps(
+                    [
+                        {"species_id": row.species_id, "common_name": row.common_name}
+                        for row in rows
+                    ]
+                ).encode("utf-8")
+                + b"\n"
+            )
+            _set_cached_list(cache_key, payload, generation)
+        return payload.to_response()
+
     @app.route("/api/species/<string:species_id>", methods=["GET"])
     def get_species(species_id):
-        species = Species.query.get_or_404(species_id)
-        return jsonify(_serialize_species(species))
+        includes = _parse_includes(request.args.get("include"))
+        if includes is None:
+            return jsonify({"error": INVALID_INCLUDE_MESSAGE}), 400
+        species = Species.query.options(
+            *_species_load_options(includes)
+        ).get_or_404(species_id)
+        return jsonify(_serialize_species(species, includes))
 
     @app.route("/api/species", methods=["GET"])
     def list_species():
-        query = Species.query
+        includes = _parse_includes(request.args.get("include"))
+        if includes is None:
+            return jsonify({"error": INVALID_INCLUDE_MESSAGE}), 400
+        query = Species.query.options(*_species_load_options(includes))
 
         sort_key = request.args.get("sort")
+        # order only matters with a sort; leave it out so it cannot vary the cache key
+        order = None
         if sort_key:
             column = SORT_FIELDS.get(sort_key)
             if column is None:
@@ -180,8 +326,69 @@ def create_app():
                 return jsonify({"error": "Invalid order value"}), 400
             query = query.order_by(column)
 
-        species_list = query.all()
-        return jsonify([_serialize_species(item) for item in species_list])
+        if "ids" in request.args:
+            species_ids, invalid = _parse_id_list(request.args.get("ids"))
+            if invalid is not None:
+                return jsonify({"error": f"Invalid species id: {invalid}"}), 400
+            if not species_ids:
+                return jsonify({"error": "ids is required"}), 400
+            if len(species_ids) > ID_BATCH_SIZE:
+                return jsonify(
+                    {"error": f"At most {ID_BATCH_SIZE} ids per request"}
+                ), 400
+            species_list = query.filter(Species.species_id.in_(species_ids)).all()
+            if not sort_key:
+                position = {species_id: i for i, species_id in enumerate(species_ids)}
+                species_list.sort(key=lambda item: position[item.species_id])
+            return jsonify(
+                [_serialize_species(item, includes) for item in species_list]
+            )
+
+        cache_key = (sort_key, order, tuple(sorted(includes)))
+        # fresh=1 skips this process's cached copy, which another process's
+        # writes can leave stale for up to LIST_CACHE_TTL
+        payload = None
+        if request.args.get("fresh") != "1":
+            payload = _get_cached_list(cache_key)
+        if payload is None:
+            generation = _list_cache_generation
+            species_list = query.all()
+            payload = PrecompressedPayload(
+                app.json.dumps(
+                    [_serialize_species(item, includes) for item in species_list]
+                ).encode("utf-8")
+                + b"\n"
+            )
+            _set_cached_list(cache_key, payload, generation)
+        return payload.to_response()
+
+    @app.route("/api/countries", methods=["GET"])
+    def list_countries():
+        return jsonify(list(_get_countries().values()))
+
+    @app.route("/api/countries/<string:country_id>/species", methods=["GET"])
+    def list_country_species(country_id):
+        country = _get_country(country_id)
+        if country is None:
+            return jsonify({"error": "Country not found"}), 404
+        includes = _parse_includes(request.args.get("include"))
+        if includes is None:
+            return jsonify({"error": INVALID_INCLUDE_MESSAGE}), 400
+
+        species_list = (
+            Species.query.options(*_species_load_options(includes))
+            .join(Distribution)
+            .filter(Distribution.country_id == country_id)
+            .order_by(Species.common_name)
+            .distinct()
+            .all()
+        )
+        return jsonify(
+            {
+                "country": country,
+                "species": [_serialize_species(item, includes) for item in species_list],
+            }
+        )
 
     @app.route("/api/species/<string:species_id>", methods=["PUT"])
     def update_species(species_id):
@@ -244,22 +451,82 @@ def create_app():
             )
 
         db.session.commit()
+        _invalidate_list_cache()
+        if changed_fields:
+            publish_change(species.species_id, "updated", sorted(set(changed_fields)))
         return jsonify(_serialize_species(species))
 
     @app.route("/api/species/<string:species_id>", methods=["DELETE"])
     def delete_species(species_id):
-        species = Species.query.get_or_404(species_id)
-        default_url = _get_default_image_url()
-        for image in species.images:
-            _delete_image_file(image, app.config["UPLOAD_FOLDER"], default_url)
-
-        db.session.delete(species)
-        db.session.commit()
+        Species.query.get_or_404(species_id)
+        _delete_species_ids([species_id])
         return jsonify({"status": "deleted"})
 
+    @app.route("/api/species", methods=["DELETE"])
+    def bulk_delete_species():
+        species_ids, invalid = _parse_id_list(request.args.get("ids"))
+        if invalid is not None:
+            return jsonify({"error": f"Invalid species id: {invalid}"}), 400
+        if not species_ids:
+            return jsonify({"error": "ids is required"}), 400
+
+        deleted = _delete_species_ids(species_ids)
+        return jsonify({"status": "deleted", "deleted": deleted})
+
+    if os.getenv("STARTUP_PROFILE") == "1":
+        init_seconds = time.perf_counter() - init_started
+        report = f"Startup: create_app {init_seconds * 1000:.1f} ms"
+        if seed_seconds is not None:
+            report += f" (seed on startup {seed_seconds * 1000:.1f} ms)"
+        print(report)
+
     return app
 
 
+def _seed_once(app):
+    """Create tables and seed once, even when several workers boot together."""
+    with app.app_context():
+        # Warm boots find the data already there and never wait on the lock
+        if _is_seeded():
+            return
+    os.makedirs(app.instance_path, exist_ok=True)
+    lock_path = os.path.join(app.instance_path, "seed-on-startup.lock")
+    with _file_lock(lock_path), app.app_context():
+        db.create_all()
+        _seed_fake_data(30)
+
+
+def _is_seeded():
+    if not inspect(db.engine).has_table("species"):
+        return False
+    return Species.query.first() is not None
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock between processes; the OS releases it if the holder dies."""
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about 10 seconds; keep waiting
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
 # Helper functions for payload processing, normalization, serialization, and seeding
 def _get_payload():
     if request.is_json:
@@ -317,6 +584,47 @@ def _normalize_uuid(value):
         return None
 
 
+def _parse_id_list(raw_ids):
+    """Split a comma-separated id list; returns (unique ids, first invalid value)."""
+    species_ids = []
+    for value in (raw_ids or "").split(","):
+        value = value.strip()
+        if not value:
+            continue
+        species_id = _normalize_uuid(value)
+        if species_id is None:
+            return [], value
+        species_ids.append(species_id)
+    return list(dict.fromkeys(species_ids)), None
+
+
+def _parse_includes(value):
+    if value is None:
+        return DEFAULT_SPECIES_INCLUDES
+    includes = frozenset(item.strip() for item in value.split(",") if item.strip())
+    if not includes <= SPECIES_INCLUDES:
+        return None
+    # Authors are only serialized on images, so they mean nothing on their own
+    if "authors" in includes and "images" not in includes:
+        return None
+    return includes
+
+
+def _species_load_options(includes):
+    options = []
+    if "taxonomy" in includes:
+        options.append(selectinload(Species.taxonomy))
+    if "images" in includes:
+        images = selectinload(Species.images)
+        if "authors" in includes:
+            images = images.selectinload(Image.author)
+        options.append(images)
+    if "distributions" in includes:
+        # Countries come from the in-memory reference cache, not a join
+        options.append(selectinload(Species.distributions))
+    return options
+
+
 def _attach_taxonomy(species, data):
     taxonomy_data = _get_value(data, "taxonomy")
     taxonomy_id = _normalize_uuid(_get_value(data, "taxonomy_id"))
@@ -368,23 +676,81 @@ def _resolve_author(data):
     author_id = _normalize_uuid(_get_value(data, "author_id"))
 
     if isinstance(author_data, dict):
-        author = Author(
-            author_name=author_data.get("author_name", "").strip() or "Unknown",
-            author_email=author_data.get("author_email"),
-            author_role=author_data.get("author_role"),
+        return _find_or_create_author(
+            (author_data.get("author_name") or "").strip() or "Unknown",
+            author_data.get("author_email"),
+            author_data.get("author_role"),
         )
-        db.session.add(author)
-        return author
     if isinstance(author_data, str) and author_data.strip():
-        author = Author(author_name=author_data.strip())
-        db.session.add(author)
-        return author
+        return _find_or_create_author(author_data.strip())
     if author_id:
         return Author.query.get(author_id)
 
     return None
 
 
+def _find_or_create_author(name, email=None, role=None):
+    """Reuse the author with this email, or this name when no email is given.
+
+    Emails match case-insensitively. A supplied role replaces the stored one, so
+    an author's role reflects their latest contribution.
+    """
+    email = (email or "").strip() or None
+    cache_key = ("email", email.lower()) if email else ("name", name)
+
+    with _author_cache_lock:
+        author_id = _author_cache.get(cache_key)
+    author = db.session.get(Author, author_id) if author_id else None
+    if author is None:
+        if email:
+            author = Author.query.filter(
+                func.lower(Author.author_email) == email.lower()
+            ).first()
+        else:
+            author = Author.query.filter_by(author_name=name, author_email=None).first()
+    if author is None:
+        author = _insert_author(name, email, role)
+    if role and author.author_role != role:
+        author.author_role = role
+
+    with _author_cache_lock:
+        if len(_author_cache) >= AUTHOR_CACHE_SIZE:
+            _author_cache.clear()
+        _author_cache[cache_key] = author.author_id
+    return author
+
+
+def _insert_author(name, email, role):
+    """Insert an author, reusing the row a concurrent request inserted first.
+
+    lower(author_email) is unique, so a lost race raises IntegrityError. The
+    insert runs in a savepoint to keep the caller's earlier writes; pysqlite
+    only opens its transaction at the first write, and a savepoint opened before
+    that would commit on release, so without earlier writes a plain flush is
+    used and rolled back instead.
+    """
+    author = Author(author_name=name, author_email=email, author_role=role)
+    db.session.flush()
+    dbapi_connection = db.session.connection().connection.dbapi_connection
+    has_writes = getattr(dbapi_connection, "in_transaction", True)
+    try:
+        if has_writes:
+            with db.session.begin_nested():
+                db.session.add(author)
+        else:
+            db.session.add(author)
+            db.session.flush()
+    except IntegrityError:
+        if not email:
+            raise
+        if not has_writes:
+            db.session.rollback()
+        author = Author.query.filter(
+            func.lower(Author.author_email) == email.lower()
+        ).one()
+    return author
+
+
 def _create_image(species, data, image_file, author):
     image_url = _get_value(data, "image_url")
     image_alt_text = _get_value(data, "image_alt_text")
@@ -413,25 +779,170 @@ def _create_image(species, data, image_file, author):
     return None
 
 
-def _delete_image_file(image, upload_folder, default_url):
-    if default_url and image.image_url == default_url:
-        return
-    if not image.image_url:
-        return
+def _delete_species_ids(species_ids):
+    """Delete species and their child rows with set-based statements."""
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    default_url = _get_default_image_url()
+    deleted = 0
+
+    for start in range(0, len(species_ids), ID_BATCH_SIZE):
+        batch = species_ids[start : start + ID_BATCH_SIZE]
+        existing_ids = [
+            row.species_id
+            for row in db.session.query(Species.species_id).filter(
+                Species.species_id.in_(batch)
+            )
+        ]
+        image_urls = [
+            row.image_url
+            for row in db.session.query(Image.image_url).filter(
+                Image.species_id.in_(batch)
+            )
+        ]
+        # Children are deleted explicitly so databases created before the
+        # ON DELETE CASCADE foreign keys behave the same as new ones
+        for model in (Image, Distribution, Modification):
+            model.query.filter(model.species_id.in_(batch)).delete(
+                synchronize_session=False
+            )
+        deleted += Species.query.filter(Species.species_id.in_(batch)).delete(
+            synchronize_session=False
+        )
+        file_paths = [
+            _upload_path_for_url(url, upload_folder, default_url) for url in image_urls
+        ]
+        file_paths = [path for path in file_paths if path]
+        if file_paths:
+            enqueue_job("delete_files", {"paths": file_paths})
+        enqueue_job("refresh_country_counts")
+        # Commit per batch so the write lock is released between batches
+        db.session.commit()
+        _invalidate_list_cache()
+        for species_id in existing_ids:
+            publish_change(species_id, "deleted")
+
+    return deleted
+
+
+def _get_cached_list(cache_key):
+    with _list_cache_lock:
+        entry = _list_cache.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if time.monotonic() >= expires_at:
+            _list_cache.pop(cache_key, None)
+            return None
+    return payload
+
+
+def _set_cached_list(cache_key, payload, generation):
+    now = time.monotonic()
+    expires_at = now + current_app.config["LIST_CACHE_TTL"]
+    with _list_cache_lock:
+        # Drop payloads built from data that a concurrent write has since replaced
+        if generation != _list_cache_generation:
+            return
+        for key, (entry_expires_at, _) in list(_list_cache.items()):
+            if now >= entry_expires_at:
+                del _list_cache[key]
+        _list_cache.pop(cache_key, None)
+        while len(_list_cache) >= LIST_CACHE_SIZE:
+            # Entries are inserted in expiry order, so the first expires soonest
+            del _list_cache[next(iter(_list_cache))]
+        _list_cache[cache_key] = (expires_at, payload)
+
+
+def _invalidate_list_cache():
+    global _list_cache_generation
+    with _list_cache_lock:
+        _list_cache_generation += 1
+        _list_cache.clear()
+
+
+def _get_countries():
+    with _country_cache_lock:
+        if time.monotonic() < _country_cache["expires_at"]:
+            return _country_cache["countries"]
+    countries = {
+        country.country_id: _serialize_country(country)
+        for country in Country.query.order_by(Country.country_name)
+    }
+    with _country_cache_lock:
+        _country_cache["countries"] = countries
+        _country_cache["expires_at"] = (
+            time.monotonic() + current_app.config["COUNTRY_CACHE_TTL"]
+        )
+    return countries
+
+
+def _get_country(country_id):
+    country = _get_countries().get(country_id)
+    if country is not None:
+        return country
+    # The id may belong to a country added since the cache was loaded; look up
+    # just that row so unknown ids cost one primary-key read, not a reload
+    row = db.session.get(Country, country_id)
+    if row is None:
+        return None
+    country = _serialize_country(row)
+    with _country_cache_lock:
+        # Copy so readers iterating the current mapping are not affected
+        countries = dict(_country_cache["countries"])
+        countries[country_id] = country
+        _country_cache["countries"] = countries
+    return country
+
+
+def _invalidate_country_cache():
+    with _country_cache_lock:
+        _country_cache["expires_at"] = 0.0
+
+
+def _upload_path_for_url(image_url, upload_folder, default_url):
+    if default_url and image_url == default_url:
+        return None
+    if not image_url:
+        return None
     uploads_prefix = "/uploads/"
-    if not image.image_url.startswith(uploads_prefix):
-        return
-    filename = image.image_url[len(uploads_prefix) :]
-    file_path = os.path.join(upload_folder, filename)
-    try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-    except OSError:
-        pass
+    if not image_url.startswith(uploads_prefix):
+        return None
+    filename = image_url[len(uploads_prefix) :]
+    # Absolute, because a separate `flask worker` may run from another directory
+    return os.path.abspath(os.path.join(upload_folder, filename))
 
 
-def _serialize_species(species):
-    return {
+@job_handler("delete_files")
+def _delete_files_job(payload):
+    for file_path in payload.get("paths", []):
+        try:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        except OSError:
+            pass
+
+
+@job_handler("refresh_country_counts")
+def _refresh_country_counts_job(payload):
+    _refresh_country_counts()
+    db.session.commit()
+    _invalidate_country_cache()
+
+
+def _refresh_country_counts():
+    """Recompute every country's species count with one correlated UPDATE."""
+    species_count = (
+        select(func.count(func.distinct(Distribution.species_id)))
+        .where(Distribution.country_id == Country.country_id)
+        .scalar_subquery()
+    )
+    Country.query.update(
+        {Country.species_count: species_count}, synchronize_session=False
+    )
+
+
+def _serialize_species(species, includes=DEFAULT_SPECIES_INCLUDES):
+    data = {
         "species_id": species.species_id,
         "common_name": species.common_name,
         "scientific_name": species.scientific_name,
@@ -443,9 +954,19 @@ def _serialize_species(species):
         "year_of_discovery": _format_date(species.year_of_discovery),
         "summary": species.summary,
         "created_at": _format_date(species.created_at),
-        "taxonomy": _serialize_taxonomy(species.taxonomy),
-        "images": [_serialize_image(image) for image in species.images],
     }
+    if "taxonomy" in includes:
+        data["taxonomy"] = _serialize_taxonomy(species.taxonomy)
+    if "images" in includes:
+        data["images"] = [
+            _serialize_image(image, "authors" in includes) for image in species.images
+        ]
+    if "distributions" in includes:
+        data["distributions"] = [
+            _serialize_distribution(distribution)
+            for distribution in species.distributions
+        ]
+    return data
 
 
 def _serialize_taxonomy(taxonomy):
@@ -474,13 +995,33 @@ def _serialize_author(author):
     }
 
 
-def _serialize_image(image):
-    return {
+def _serialize_image(image, include_author=True):
+    data = {
         "image_id": image.image_id,
         "image_url": image.image_url,
         "image_alt_text": image.image_alt_text,
         "created_at": _format_date(image.created_at),
-        "author": _serialize_author(image.author),
+    }
+    if include_author:
+        data["author"] = _serialize_author(image.author)
+    return data
+
+
+def _serialize_distribution(distribution):
+    return {
+        "distribution_id": distribution.distribution_id,
+        "population_estimate": distribution.population_estimate,
+        "country": _get_country(distribution.country_id),
+    }
+
+
+def _serialize_country(country):
+    return {
+        "country_id": country.country_id,
+        "country_name": country.country_name,
+        "continent_name": country.continent_name,
+        "country_loc": country.country_loc,
+        "species_count": country.species_count,
     }
 
 
@@ -496,15 +1037,19 @@ def _get_default_image_url():
     source_path = current_app.config.get("DEFAULT_IMAGE_SOURCE")
     if not upload_folder or not filename or not source_path:
         return None
+    target_path = os.path.join(upload_folder, filename)
+    # The copy happens once per process; later calls skip the filesystem checks
+    if target_path in _default_image_copied:
+        return f"/uploads/{filename}"
     if not os.path.exists(source_path):
         return None
     os.makedirs(upload_folder, exist_ok=True)
-    target_path = os.path.join(upload_folder, filename)
     if not os.path.exists(target_path):
         try:
             shutil.copyfile(source_path, target_path)
         except OSError:
             return None
+    _default_image_copied.add(target_path)
     return f"/uploads/{filename}"
 
 
@@ -583,8 +1128,8 @@ def _seed_from_dataset(entries, count):
     )
 
     selected = entries[: max(1, min(count, len(entries)))]
-    countries = _seed_countries(len(selected))
-    db.session.add_all([author] + countries)
+    countries = _seed_countries()
+    db.session.add(author)
     db.session.flush()
 
     species_list = []
@@ -649,49 +1194,150 @@ def _seed_from_dataset(entries, count):
         )
 
     db.session.add_all(images + modifications + distributions)
+    db.session.flush()
+    # Seeding is offline, so count inline rather than waiting on the job queue
+    _refresh_country_counts()
     db.session.commit()
+    _invalidate_list_cache()
+    _invalidate_country_cache()
     return True
 
 
-def _seed_countries(count):
-    country_names = [
-        ("Kenya", "Africa"),
-        ("Tanzania", "Africa"),
-        ("South Africa", "Africa"),
-        ("France", "Europe"),
-        ("Spain", "Europe"),
-        ("Germany", "Europe"),
-        ("Norway", "Europe"),
-        ("United Kingdom", "Europe"),
-        ("United States", "Americas"),
-        ("Canada", "Americas"),
-        ("Brazil", "Americas"),
-        ("Peru", "Americas"),
-        ("Argentina", "Americas"),
-        ("Mexico", "Americas"),
-        ("India", "Asia"),
-        ("China", "Asia"),
-        ("Japan", "Asia"),
-        ("Indonesia", "Asia"),
-        ("Australia", "Oceania"),
-        ("New Zealand", "Oceania"),
-    ]
+def _seed_countries():
+    """Return the seed countries, creating only those not already stored."""
+    existing = {
+        country.country_name: country
+        for country in Country.query.filter(
+            Country.country_name.in_([name for name, *_ in SEED_COUNTRIES])
+        )
+    }
     countries = []
-    for i in range(count):
-        name, continent = country_names[i % len(country_names)]
-        countries.append(
-            Country(
+    for name, continent, lat, lng in SEED_COUNTRIES:
+        country = existing.get(name)
+        if country is None:
+            country = Country(
                 country_name=name,
                 continent_name=continent,
-                country_loc={
-                    "lat": round(random.uniform(-50, 60), 4),
-                    "lng": round(random.uniform(-120, 140), 4),
-                },
+                country_loc={"lat": lat, "lng": lng},
             )
-        )
+            db.session.add(country)
+        countries.append(country)
     return countries
 
 
+def _upgrade_schema():
+    """Apply schema changes that create_all cannot make to existing tables."""
+    inspector = inspect(db.engine)
+    country_columns = {column["name"] for column in inspector.get_columns("country")}
+    if "species_count" not in country_columns:
+        db.session.execute(
+            text(
+                "ALTER TABLE country "
+                "ADD COLUMN species_count INTEGER NOT NULL DEFAULT 0"
+            )
+        )
+        db.session.commit()
+
+    # Duplicates must be merged before country_name can be made unique
+    removed = _dedupe_countries()
+    # ...and authors before lower(author_email) can; the unique index
+    # replaces the plain one earlier versions created
+    removed_authors = _dedupe_authors()
+    db.session.execute(text("DROP INDEX IF EXISTS ix_author_email_lower"))
+    db.session.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_author_email_lower "
+            "ON author (lower(author_email))"
+        )
+    )
+
+    unique_columns = [
+        constraint["column_names"]
+        for constraint in inspector.get_unique_constraints("country")
+    ] + [
+        index["column_names"]
+        for index in inspector.get_indexes("country")
+        if index["unique"]
+    ]
+    if ["country_name"] not in unique_columns:
+        db.session.execute(
+            text(
+                "CREATE UNIQUE INDEX uq_country_country_name ON country (country_name)"
+            )
+        )
+    for statement in UPGRADE_INDEXES:
+        db.session.execute(text(statement))
+    db.session.commit()
+    return removed, removed_authors
+
+
+def _dedupe_countries():
+    canonical_ids = {}
+    duplicate_ids = {}
+    # Read only the columns every schema version has
+    rows = db.session.query(Country.country_id, Country.country_name).order_by(
+        Country.country_name, Country.country_id
+    )
+    for country_id, country_name in rows:
+        if country_name in canonical_ids:
+            duplicate_ids[country_id] = canonical_ids[country_name]
+        else:
+            canonical_ids[country_name] = country_id
+
+    for duplicate_id, canonical_id in duplicate_ids.items():
+        Distribution.query.filter_by(country_id=duplicate_id).update(
+            {Distribution.country_id: canonical_id}, synchronize_session=False
+        )
+    if duplicate_ids:
+        Country.query.filter(Country.country_id.in_(list(duplicate_ids))).delete(
+            synchronize_session=False
+        )
+    # Also fills species_count on databases where the column was just added
+    _refresh_country_counts()
+    db.session.commit()
+    _invalidate_country_cache()
+    return len(duplicate_ids)
+
+
+def _dedupe_authors():
+    """Merge authors whose emails differ only by case or surrounding spaces."""
+    Author.query.filter(func.trim(Author.author_email) == "").update(
+        {Author.author_email: None}, synchronize_session=False
+    )
+    Author.query.filter(Author.author_email != func.trim(Author.author_email)).update(
+        {Author.author_email: func.trim(Author.author_email)},
+        synchronize_session=False,
+    )
+
+    canonical_ids = {}
+    duplicate_ids = {}
+    rows = (
+        db.session.query(Author.author_id, Author.author_email)
+        .filter(Author.author_email.isnot(None))
+        .order_by(Author.author_id)
+    )
+    for author_id, author_email in rows:
+        email = author_email.lower()
+        if email in canonical_ids:
+            duplicate_ids[author_id] = canonical_ids[email]
+        else:
+            canonical_ids[email] = author_id
+
+    for duplicate_id, canonical_id in duplicate_ids.items():
+        for model in (Image, Modification):
+            model.query.filter_by(author_id=duplicate_id).update(
+                {model.author_id: canonical_id}, synchronize_session=False
+            )
+    if duplicate_ids:
+        Author.query.filter(Author.author_id.in_(list(duplicate_ids))).delete(
+            synchronize_session=False
+        )
+    db.session.commit()
+    with _author_cache_lock:
+        _author_cache.clear()
+    return len(duplicate_ids)
+
+
 def _random_characteristics():
     return {
         "height_cm": round(random.uniform(10, 160), 1),
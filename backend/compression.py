@@ -0,0 +1,161 @@
+import gzip
+import os
+import threading
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "text/css",
+    "text/event-stream",
+    "text/html",
+    "text/plain",
+}
+
+# Precompressed payloads are built once and served many times, so spend more CPU on them
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 9
+
+
+def init_compression(app):
+    app.config.setdefault(
+        "COMPRESS_ENABLED", os.getenv("COMPRESS_ENABLED", "1") == "1"
+    )
+    app.config.setdefault(
+        "COMPRESS_MIN_SIZE", int(os.getenv("COMPRESS_MIN_SIZE", "500"))
+    )
+    app.config.setdefault("COMPRESS_LEVEL", int(os.getenv("COMPRESS_LEVEL", "6")))
+    app.config.setdefault(
+        "COMPRESS_BROTLI_QUALITY", int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+    )
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config["COMPRESS_ENABLED"]:
+            return response
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return response
+        if response.direct_passthrough or "Content-Encoding" in response.headers:
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = negotiate_encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(
+                response.iter_encoded(), encoding, app.config
+            )
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < app.config["COMPRESS_MIN_SIZE"]:
+                return response
+            response.set_data(
+                compress_bytes(
+                    data,
+                    encoding,
+                    app.config["COMPRESS_LEVEL"],
+                    app.config["COMPRESS_BROTLI_QUALITY"],
+                )
+            )
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+def negotiate_encoding():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def compress_bytes(data, encoding, level, brotli_quality):
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class PrecompressedPayload:
+    """A response body kept alongside its compressed encodings."""
+
+    def __init__(self, data, mimetype="application/json"):
+        self.data = data
+        self.mimetype = mimetype
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        if encoding is None:
+            return self.data
+        with self._lock:
+            if encoding not in self._encoded:
+                self._encoded[encoding] = compress_bytes(
+                    self.data,
+                    encoding,
+                    PRECOMPRESS_GZIP_LEVEL,
+                    PRECOMPRESS_BROTLI_QUALITY,
+                )
+            return self._encoded[encoding]
+
+    def to_response(self):
+        encoding = None
+        if (
+            current_app.config["COMPRESS_ENABLED"]
+            and len(self.data) >= current_app.config["COMPRESS_MIN_SIZE"]
+        ):
+            encoding = negotiate_encoding()
+        response = current_app.response_class(
+            self.encoded(encoding), mimetype=self.mimetype
+        )
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+
+class _BrotliStreamCompressor:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk):
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _GzipStreamCompressor:
+    def __init__(self, level):
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def _compress_stream(chunks, encoding, config):
+    if encoding == "br":
+        compressor = _BrotliStreamCompressor(config["COMPRESS_BROTLI_QUALITY"])
+    else:
+        compressor = _GzipStreamCompressor(config["COMPRESS_LEVEL"])
+    # Flush after each chunk so clients see streamed data without waiting for the end
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
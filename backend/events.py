@@ -0,0 +1,165 @@
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+from collections import deque
+
+from flask import current_app, request
+
+
+class ChangeBroadcaster:
+    """Fan out change notices to many subscribers without blocking the publisher.
+
+    Each subscriber has a bounded buffer. A subscriber that falls behind has its
+    buffer replaced by a single resync notice, telling the client to reload.
+
+    Versions only count within one broadcaster, so event ids are prefixed with a
+    random epoch; an id from another process or an earlier run gets a resync.
+    """
+
+    def __init__(self, buffer_size=100, history_size=256):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._version = 0
+        self.epoch = secrets.token_hex(8)
+        self.buffer_size = buffer_size
+
+    def publish(self, notice):
+        with self._lock:
+            self._version += 1
+            event = dict(notice, version=self._version)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            _offer(subscriber, event)
+        return event
+
+    def subscribe(self, last_event_id=None):
+        subscriber = queue.Queue(maxsize=self.buffer_size)
+        last_version = self._parse_event_id(last_event_id)
+        with self._lock:
+            if last_event_id:
+                missed = []
+                oldest = self._history[0]["version"] if self._history else None
+                if last_version is not None:
+                    missed = [
+                        event
+                        for event in self._history
+                        if event["version"] > last_version
+                    ]
+                if (
+                    last_version is None
+                    or last_version > self._version
+                    or (oldest is not None and last_version < oldest - 1)
+                    or len(missed) > self.buffer_size
+                ):
+                    missed = [{"action": "resync", "version": self._version}]
+                for event in missed:
+                    subscriber.put_nowait(event)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def event_id(self, event):
+        return f"{self.epoch}:{event['version']}"
+
+    def _parse_event_id(self, event_id):
+        """Return the version of an id from this broadcaster, else None."""
+        epoch, _, version = (event_id or "").partition(":")
+        if epoch != self.epoch:
+            return None
+        try:
+            return int(version)
+        except ValueError:
+            return None
+
+
+def _offer(subscriber, event):
+    try:
+        subscriber.put_nowait(event)
+    except queue.Full:
+        _drain(subscriber)
+        try:
+            subscriber.put_nowait({"action": "resync", "version": event["version"]})
+        except queue.Full:
+            pass
+
+
+def _drain(subscriber):
+    while True:
+        try:
+            subscriber.get_nowait()
+        except queue.Empty:
+            return
+
+
+def init_events(app):
+    app.config.setdefault(
+        "EVENTS_BUFFER_SIZE", int(os.getenv("EVENTS_BUFFER_SIZE", "100"))
+    )
+    app.config.setdefault(
+        "EVENTS_HEARTBEAT", float(os.getenv("EVENTS_HEARTBEAT", "15"))
+    )
+    app.config.setdefault(
+        "EVENTS_MAX_STREAM_SECONDS",
+        float(os.getenv("EVENTS_MAX_STREAM_SECONDS", "300")),
+    )
+    app.extensions["change_broadcaster"] = ChangeBroadcaster(
+        buffer_size=app.config["EVENTS_BUFFER_SIZE"]
+    )
+
+    @app.route("/api/events", methods=["GET"])
+    def stream_events():
+        """Stream change notices.
+
+        Each open stream occupies one server thread (or greenlet) while it is
+        connected, so serve the app with a threaded or async server. Streams end
+        after EVENTS_MAX_STREAM_SECONDS; EventSource reconnects on its own and
+        replays missed notices through Last-Event-ID.
+        """
+        broadcaster = app.extensions["change_broadcaster"]
+        last_event_id = request.headers.get("Last-Event-ID") or request.args.get(
+            "last_event_id"
+        )
+        subscriber = broadcaster.subscribe(last_event_id)
+        heartbeat = app.config["EVENTS_HEARTBEAT"]
+        deadline = time.monotonic() + app.config["EVENTS_MAX_STREAM_SECONDS"]
+
+        def generate():
+            try:
+                yield "retry: 3000\n\n"
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    try:
+                        event = subscriber.get(timeout=min(heartbeat, remaining))
+                    except queue.Empty:
+                        yield ": keepalive\n\n"
+                        continue
+                    yield _format_event(event, broadcaster.event_id(event))
+            finally:
+                broadcaster.unsubscribe(subscriber)
+
+        response = app.response_class(generate(), mimetype="text/event-stream")
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+
+def publish_change(species_id, action, fields=None):
+    """Notify connected clients that a species was created, updated or deleted."""
+    return current_app.extensions["change_broadcaster"].publish(
+        {"species_id": species_id, "action": action, "fields": fields or []}
+    )
+
+
+def _format_event(event, event_id):
+    data = json.dumps(event, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {event['action']}\ndata: {data}\n\n"
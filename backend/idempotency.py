@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app, g, jsonify, request
+from sqlalchemy.exc import IntegrityError
+
+from jobs import enqueue_job, job_handler
+from models import IdempotencyRecord, db
+
+
+IDEMPOTENT_METHODS = {"POST", "PUT", "DELETE"}
+MAX_KEY_LENGTH = 255
+
+_purge_lock = threading.Lock()
+_last_purge_enqueued = 0.0
+
+
+def init_idempotency(app):
+    app.config.setdefault(
+        "IDEMPOTENCY_TTL", int(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))
+    )
+    app.config.setdefault(
+        "IDEMPOTENCY_LEASE_SECONDS",
+        int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60")),
+    )
+
+    @app.before_request
+    def replay_idempotent_request():
+        key = request.headers.get("Idempotency-Key")
+        if not key or request.method not in IDEMPOTENT_METHODS:
+            return None
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({"error": "Idempotency-Key is too long"}), 400
+
+        fingerprint = _request_fingerprint()
+        record = db.session.get(IdempotencyRecord, key)
+        if record is not None and _is_stale(record):
+            # Conditional, so a claim a concurrent retry just made is kept
+            IdempotencyRecord.query.filter_by(
+                idempotency_key=key, created_at=record.created_at
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            db.session.expunge(record)
+            record = None
+
+        if record is not None:
+            if record.request_fingerprint != fingerprint:
+                return jsonify(
+                    {"error": "Idempotency-Key was already used for a different request"}
+                ), 422
+            if record.status_code is None:
+                return jsonify(
+                    {"error": "A request with this Idempotency-Key is in progress"}
+                ), 409
+            response = current_app.response_class(
+                record.response_body,
+                status=record.status_code,
+                mimetype=record.response_mimetype,
+            )
+            response.headers["Idempotent-Replayed"] = "true"
+            return response
+
+        # The primary key makes concurrent first attempts race on this insert
+        db.session.add(
+            IdempotencyRecord(idempotency_key=key, request_fingerprint=fingerprint)
+        )
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify(
+                {"error": "A request with this Idempotency-Key is in progress"}
+            ), 409
+        g.idempotency_key = key
+        return None
+
+    @app.after_request
+    def store_idempotent_response(response):
+        key = g.pop("idempotency_key", None)
+        if key is None:
+            return response
+
+        db.session.rollback()
+        record = db.session.get(IdempotencyRecord, key)
+        if record is not None:
+            if response.status_code >= 500:
+                # Let the client retry a request that failed on our side
+                db.session.delete(record)
+            else:
+                record.status_code = response.status_code
+                record.response_body = response.get_data(as_text=True)
+                record.response_mimetype = response.mimetype
+            _maybe_enqueue_purge()
+            db.session.commit()
+        return response
+
+    @app.teardown_request
+    def release_idempotency_key(exc):
+        key = g.pop("idempotency_key", None)
+        if key is None:
+            return
+        # The request failed before a response was stored; free the key for retries
+        db.session.rollback()
+        IdempotencyRecord.query.filter_by(
+            idempotency_key=key, status_code=None
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+
+@job_handler("purge_idempotency_records")
+def _purge_idempotency_records_job(payload):
+    IdempotencyRecord.query.filter(
+        IdempotencyRecord.created_at < _expiry_cutoff()
+    ).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def _expiry_cutoff():
+    return datetime.utcnow() - timedelta(seconds=current_app.config["IDEMPOTENCY_TTL"])
+
+
+def _is_stale(record):
+    """Expired records, and claims whose request died before storing a response."""
+    if record.created_at < _expiry_cutoff():
+        return True
+    lease = timedelta(seconds=current_app.config["IDEMPOTENCY_LEASE_SECONDS"])
+    return record.status_code is None and record.created_at < datetime.utcnow() - lease
+
+
+def _maybe_enqueue_purge():
+    global _last_purge_enqueued
+    with _purge_lock:
+        if _last_purge_enqueued and time.monotonic() - _last_purge_enqueued < 3600:
+            return
+        _last_purge_enqueued = time.monotonic()
+    enqueue_job("purge_idempotency_records")
+
+
+def _request_fingerprint():
+    """Hash what the request means, so retried multipart bodies with new boundaries match."""
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.full_path}\n".encode("utf-8"))
+    if request.is_json:
+        payload = request.get_json(silent=True)
+        digest.update(json.dumps(payload, sort_keys=True).encode("utf-8"))
+    else:
+        for key, values in sorted(request.form.lists()):
+            digest.update(json.dumps([key, values]).encode("utf-8"))
+        files = sorted(request.files.items(multi=True), key=lambda item: item[0])
+        for key, file in files:
+            digest.update(json.dumps([key, file.filename]).encode("utf-8"))
+            for chunk in iter(lambda: file.stream.read(65536), b""):
+                digest.update(chunk)
+            file.stream.seek(0)
+    return digest.hexdigest()
@@ -0,0 +1,192 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session
+
+from models import Job, db
+
+
+JOB_HANDLERS = {}
+
+_wakeup = threading.Event()
+_pool_lock = threading.Lock()
+_pool_threads = []
+
+
+def job_handler(job_type):
+    """Register a function as the handler for ``job_type`` jobs."""
+
+    def decorator(func):
+        JOB_HANDLERS[job_type] = func
+        return func
+
+    return decorator
+
+
+def init_jobs(app):
+    app.config.setdefault("JOB_WORKERS", int(os.getenv("JOB_WORKERS", "2")))
+    app.config.setdefault(
+        "JOB_POLL_INTERVAL", float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+    )
+    app.config.setdefault("JOB_MAX_ATTEMPTS", 3)
+    app.config.setdefault("JOB_LEASE_SECONDS", 300)
+
+    @app.before_request
+    def start_job_workers():
+        # Started by the serving process only, so CLI commands never leave
+        # daemon threads holding claimed jobs when they exit
+        if app.config["JOB_WORKERS"] > 0 and not _pool_threads:
+            _ensure_worker_pool(app)
+
+    @app.cli.command("worker")
+    @click.option("--threads", default=1, show_default=True, type=int)
+    @click.option(
+        "--burst", is_flag=True, help="Exit once the queue is empty."
+    )
+    def worker(threads, burst):
+        """Process queued background jobs."""
+        if burst:
+            with app.app_context():
+                processed = run_pending_jobs()
+            print(f"Processed {processed} jobs.")
+            return
+
+        print(f"Worker started with {threads} threads.")
+        threads_started = [
+            threading.Thread(target=_worker_loop, args=(app,), daemon=True)
+            for _ in range(max(1, threads))
+        ]
+        for thread in threads_started:
+            thread.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print("Worker stopped.")
+
+
+def enqueue_job(job_type, payload=None, delay=0):
+    """Add a job to the current session; it becomes visible on commit."""
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+    now = datetime.utcnow()
+    job = Job(
+        job_type=job_type,
+        payload=payload or {},
+        created_at=now,
+        available_at=now + timedelta(seconds=delay),
+    )
+    db.session.add(job)
+    db.session.info["jobs_enqueued"] = True
+    return job
+
+
+def run_pending_jobs(limit=None):
+    """Run claimable jobs in the current app context until the queue is empty."""
+    processed = 0
+    while limit is None or processed < limit:
+        job = _claim_next_job()
+        if job is None:
+            break
+        _run_job(job)
+        processed += 1
+    return processed
+
+
+@event.listens_for(Session, "after_commit")
+def _signal_workers(session):
+    if session.info.pop("jobs_enqueued", False):
+        _wakeup.set()
+
+
+def _ensure_worker_pool(app):
+    with _pool_lock:
+        _pool_threads[:] = [thread for thread in _pool_threads if thread.is_alive()]
+        for _ in range(app.config["JOB_WORKERS"] - len(_pool_threads)):
+            thread = threading.Thread(
+                target=_worker_loop, args=(app,), name="job-worker", daemon=True
+            )
+            thread.start()
+            _pool_threads.append(thread)
+
+
+def _worker_loop(app):
+    poll_interval = app.config["JOB_POLL_INTERVAL"]
+    while True:
+        try:
+            with app.app_context():
+                processed = run_pending_jobs(limit=50)
+        except Exception as exc:
+            app.logger.exception("Job worker error: %s", exc)
+            processed = 0
+        if not processed:
+            _wakeup.wait(poll_interval)
+            _wakeup.clear()
+
+
+def _claim_next_job():
+    lease = timedelta(seconds=current_app.config["JOB_LEASE_SECONDS"])
+    while True:
+        now = datetime.utcnow()
+        candidate = (
+            db.session.query(Job.job_id)
+            .filter(
+                or_(
+                    (Job.status == "pending") & (Job.available_at <= now),
+                    (Job.status == "running") & (Job.locked_at < now - lease),
+                )
+            )
+            .order_by(Job.available_at)
+            .first()
+        )
+        if candidate is None:
+            db.session.rollback()
+            return None
+
+        # Conditional update so concurrent workers cannot claim the same job
+        claimed = (
+            Job.query.filter(
+                Job.job_id == candidate.job_id,
+                or_(
+                    Job.status == "pending",
+                    (Job.status == "running") & (Job.locked_at < now - lease),
+                ),
+            ).update(
+                {"status": "running", "locked_at": now, "attempts": Job.attempts + 1},
+                synchronize_session=False,
+            )
+        )
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, candidate.job_id)
+
+
+def _run_job(job):
+    handler = JOB_HANDLERS.get(job.job_type)
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job type: {job.job_type}")
+        handler(job.payload or {})
+    except Exception as exc:
+        db.session.rollback()
+        job = db.session.get(Job, job.job_id)
+        job.last_error = str(exc)
+        job.locked_at = None
+        if job.attempts >= current_app.config["JOB_MAX_ATTEMPTS"]:
+            job.status = "failed"
+            current_app.logger.error("Job %s failed: %s", job.job_id, exc)
+        else:
+            job.status = "pending"
+            job.available_at = datetime.utcnow() + timedelta(
+                seconds=2 ** job.attempts
+            )
+        db.session.commit()
+        return
+
+    db.session.delete(job)
+    db.session.commit()
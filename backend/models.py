@@ -1,11 +1,23 @@
-from datetime import date
+import sqlite3
+from datetime import date, datetime
 from uuid import uuid4
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
 
 
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are enabled per connection
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
 def _generate_uuid():
     return str(uuid4())
 
@@ -29,7 +41,7 @@ class Author(db.Model):
     __tablename__ = "author"
 
     author_id = db.Column(db.String(36), primary_key=True, default=_generate_uuid)
-    author_name = db.Column(db.String(120), nullable=False)
+    author_name = db.Column(db.String(120), nullable=False, index=True)
     author_email = db.Column(db.String(120))
     author_role = db.Column(db.String(120))
 
@@ -37,8 +49,17 @@ class Author(db.Model):
     modifications = db.relationship("Modification", back_populates="author")
 
 
+# Authors are matched on lower(author_email); unique so concurrent inserts of
+# the same new email cannot create two authors
+db.Index("uq_author_email_lower", db.func.lower(Author.author_email), unique=True)
+
+
 class Species(db.Model):
     __tablename__ = "species"
+    # Covers id + common_name lookups so pickers never read full species rows
+    __table_args__ = (
+        db.Index("ix_species_common_name_id", "common_name", "species_id"),
+    )
 
     species_id = db.Column(db.String(36), primary_key=True, default=_generate_uuid)
     common_name = db.Column(db.String(120), nullable=False)
@@ -56,13 +77,22 @@ class Species(db.Model):
 
     taxonomy = db.relationship("Taxonomy", back_populates="species_list")
     images = db.relationship(
-        "Image", back_populates="species", cascade="all, delete-orphan"
+        "Image",
+        back_populates="species",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     distributions = db.relationship(
-        "Distribution", back_populates="species", cascade="all, delete-orphan"
+        "Distribution",
+        back_populates="species",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     modifications = db.relationship(
-        "Modification", back_populates="species", cascade="all, delete-orphan"
+        "Modification",
+        back_populates="species",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
 
@@ -75,7 +105,10 @@ class Image(db.Model):
     created_at = db.Column(db.Date, default=date.today, nullable=False)
     author_id = db.Column(db.String(36), db.ForeignKey("author.author_id"))
     species_id = db.Column(
-        db.String(36), db.ForeignKey("species.species_id"), nullable=False
+        db.String(36),
+        db.ForeignKey("species.species_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
 
     species = db.relationship("Species", back_populates="images")
@@ -86,9 +119,11 @@ class Country(db.Model):
     __tablename__ = "country"
 
     country_id = db.Column(db.String(36), primary_key=True, default=_generate_uuid)
-    country_name = db.Column(db.String(120), nullable=False)
+    country_name = db.Column(db.String(120), nullable=False, unique=True)
     continent_name = db.Column(db.String(120))
     country_loc = db.Column(db.JSON)
+    # Maintained by the refresh_country_counts job rather than counted per request
+    species_count = db.Column(db.Integer, default=0, nullable=False)
 
     distributions = db.relationship("Distribution", back_populates="country")
 
@@ -100,10 +135,13 @@ class Distribution(db.Model):
         db.String(36), primary_key=True, default=_generate_uuid
     )
     species_id = db.Column(
-        db.String(36), db.ForeignKey("species.species_id"), nullable=False
+        db.String(36),
+        db.ForeignKey("species.species_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     country_id = db.Column(
-        db.String(36), db.ForeignKey("country.country_id"), nullable=False
+        db.String(36), db.ForeignKey("country.country_id"), nullable=False, index=True
     )
     population_estimate = db.Column(db.Integer)
 
@@ -117,10 +155,42 @@ class Modification(db.Model):
     modif_id = db.Column(db.String(36), primary_key=True, default=_generate_uuid)
     author_id = db.Column(db.String(36), db.ForeignKey("author.author_id"))
     species_id = db.Column(
-        db.String(36), db.ForeignKey("species.species_id"), nullable=False
+        db.String(36),
+        db.ForeignKey("species.species_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     modif_date = db.Column(db.Date, default=date.today, nullable=False)
     modif_fields = db.Column(db.JSON)
 
     author = db.relationship("Author", back_populates="modifications")
     species = db.relationship("Species", back_populates="modifications")
+
+
+class Job(db.Model):
+    __tablename__ = "job"
+    __table_args__ = (db.Index("ix_job_status_available", "status", "available_at"),)
+
+    job_id = db.Column(db.String(36), primary_key=True, default=_generate_uuid)
+    job_type = db.Column(db.String(80), nullable=False)
+    payload = db.Column(db.JSON)
+    status = db.Column(db.String(20), default="pending", nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    available_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_at = db.Column(db.DateTime)
+
+
+class IdempotencyRecord(db.Model):
+    __tablename__ = "idempotency_record"
+
+    idempotency_key = db.Column(db.String(255), primary_key=True)
+    request_fingerprint = db.Column(db.String(64), nullable=False)
+    # NULL until the first request with this key has produced a response
+    status_code = db.Column(db.Integer)
+    response_body = db.Column(db.Text)
+    response_mimetype = db.Column(db.String(120))
+    created_at = db.Column(
+        db.DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
@@ -5,11 +5,49 @@ const API_BASE =
 async function handleResponse(response) {
   if (!response.ok) {
     const message = await response.text();
-    throw new Error(message || "Request failed");
+    const error = new Error(message || "Request failed");
+    error.status = response.status;
+    throw error;
   }
   return response.json();
 }
 
+// Key for one form submission; reuse it when retrying that submission.
+// crypto.randomUUID only exists in secure contexts (https or localhost).
+export function createIdempotencyKey() {
+  if (typeof crypto !== "undefined" && crypto.randomUUID) {
+    return crypto.randomUUID();
+  }
+  const bytes = new Uint8Array(16);
+  if (typeof crypto !== "undefined" && crypto.getRandomValues) {
+    crypto.getRandomValues(bytes);
+  } else {
+    for (let i = 0; i < bytes.length; i += 1) {
+      bytes[i] = Math.floor(Math.random() * 256);
+    }
+  }
+  bytes[6] = (bytes[6] & 0x0f) | 0x40;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, "0"));
+  return [
+    hex.slice(0, 4).join(""),
+    hex.slice(4, 6).join(""),
+    hex.slice(6, 8).join(""),
+    hex.slice(8, 10).join(""),
+    hex.slice(10).join(""),
+  ].join("-");
+}
+
+// A retryable submission keeps its key unless the server rejected it outright
+// (409 means the first attempt is still running, so the key stays valid)
+export function shouldResetIdempotencyKey(error) {
+  return Boolean(error.status) && error.status !== 409;
+}
+
+function idempotencyHeaders(idempotencyKey) {
+  return idempotencyKey ? { "Idempotency-Key": idempotencyKey } : {};
+}
+
 /* API functions */
 
 // Fetch species list with optional query parameters
@@ -29,8 +67,26 @@ export async function fetchSpeciesById(id) {
   return handleResponse(response);
 }
 
+// Fetch several species in one request, optionally limiting the relations returned
+export async function fetchSpeciesByIds(ids, include) {
+  const url = new URL(`${API_BASE}/api/species`);
+  url.searchParams.set("ids", ids.join(","));
+  if (include !== undefined) {
+    url.searchParams.set("include", include.join(","));
+  }
+  const response = await fetch(url);
+  return handleResponse(response);
+}
+
+// Fetch only species ids and common names, for pickers
+export async function fetchSpeciesIndex() {
+  const response = await fetch(`${API_BASE}/api/species/index`);
+  return handleResponse(response);
+}
+
 // Creation, update and deletion functions
-export async function createSpecies(payload, imageFile) {
+// Retrying with the same key replays the first response instead of writing twice
+export async function createSpecies(payload, imageFile, idempotencyKey) {
   if (imageFile) {
     const formData = new FormData();
     Object.entries(payload).forEach(([key, value]) => {
@@ -41,6 +97,7 @@ export async function createSpecies(payload, imageFile) {
     formData.append("image", imageFile);
     const response = await fetch(`${API_BASE}/api/species`, {
       method: "POST",
+      headers: idempotencyHeaders(idempotencyKey),
       body: formData,
     });
     return handleResponse(response);
@@ -48,13 +105,16 @@ export async function createSpecies(payload, imageFile) {
 
   const response = await fetch(`${API_BASE}/api/species`, {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: {
+      "Content-Type": "application/json",
+      ...idempotencyHeaders(idempotencyKey),
+    },
     body: JSON.stringify(payload),
   });
   return handleResponse(response);
 }
 
-export async function updateSpecies(id, payload, imageFile) {
+export async function updateSpecies(id, payload, imageFile, idempotencyKey) {
   if (imageFile) {
     const formData = new FormData();
     Object.entries(payload).forEach(([key, value]) => {
@@ -65,6 +125,7 @@ export async function updateSpecies(id, payload, imageFile) {
     formData.append("image", imageFile);
     const response = await fetch(`${API_BASE}/api/species/${id}`, {
       method: "PUT",
+      headers: idempotencyHeaders(idempotencyKey),
       body: formData,
     });
     return handleResponse(response);
@@ -72,7 +133,10 @@ export async function updateSpecies(id, payload, imageFile) {
 
   const response = await fetch(`${API_BASE}/api/species/${id}`, {
     method: "PUT",
-    headers: { "Content-Type": "application/json" },
+    headers: {
+      "Content-Type": "application/json",
+      ...idempotencyHeaders(idempotencyKey),
+    },
     body: JSON.stringify(payload),
   });
   return handleResponse(response);
@@ -85,6 +149,15 @@ export async function deleteSpecies(id) {
   return handleResponse(response);
 }
 
+// Subscribe to live species changes; returns a function that closes the stream
+export function subscribeToSpeciesChanges(onChange) {
+  const source = new EventSource(`${API_BASE}/api/events`);
+  ["created", "updated", "deleted", "resync"].forEach((action) => {
+    source.addEventListener(action, (event) => onChange(JSON.parse(event.data)));
+  });
+  return () => source.close();
+}
+
 //Utility function
 export function resolveImageUrl(imageUrl) {
   if (!imageUrl) {
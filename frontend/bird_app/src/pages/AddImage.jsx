@@ -1,5 +1,10 @@
-import { useEffect, useState } from "react";
-import { fetchSpeciesList, updateSpecies } from "../api.js";
+import { useEffect, useRef, useState } from "react";
+import {
+  createIdempotencyKey,
+  fetchSpeciesIndex,
+  shouldResetIdempotencyKey,
+  updateSpecies,
+} from "../api.js";
 
 function AddImage() {
   const [speciesList, setSpeciesList] = useState([]);
@@ -9,9 +14,11 @@ function AddImage() {
   const [imageFile, setImageFile] = useState(null);
   const [status, setStatus] = useState({ type: "", message: "" });
   const [busy, setBusy] = useState(false);
+  // Shared by retries of the same submission so the server can deduplicate them
+  const submitKeyRef = useRef(null);
 
   useEffect(() => {
-    fetchSpeciesList()
+    fetchSpeciesIndex()
       .then((data) => setSpeciesList(data))
       .catch(() => setSpeciesList([]));
   }, []);
@@ -36,12 +43,19 @@ function AddImage() {
         image_url: imageUrl,
         image_alt_text: altText,
       };
-      await updateSpecies(selectedId, payload, imageFile);
+      if (!submitKeyRef.current) {
+        submitKeyRef.current = createIdempotencyKey();
+      }
+      await updateSpecies(selectedId, payload, imageFile, submitKeyRef.current);
+      submitKeyRef.current = null;
       setStatus({ type: "success", message: "Image added successfully." });
       setImageUrl("");
       setAltText("");
       setImageFile(null);
     } catch (error) {
+      if (shouldResetIdempotencyKey(error)) {
+        submitKeyRef.current = null;
+      }
       setStatus({
         type: "error",
         message: error.message || "Unable to add image.",
@@ -1,5 +1,9 @@
-import { useState } from "react";
-import { createSpecies } from "../api.js";
+import { useRef, useState } from "react";
+import {
+  createIdempotencyKey,
+  createSpecies,
+  shouldResetIdempotencyKey,
+} from "../api.js";
 
 // Intit form state fields
 const initialState = {
@@ -31,6 +35,8 @@ function AddSpecies() {
   const [imageFile, setImageFile] = useState(null);
   const [status, setStatus] = useState({ type: "", message: "" });
   const [busy, setBusy] = useState(false);
+  // Shared by retries of the same submission so the server can deduplicate them
+  const submitKeyRef = useRef(null);
 
   const handleChange = (event) => {
     const { name, value } = event.target;
@@ -174,7 +180,11 @@ function AddSpecies() {
         delete payload.image_url;
       }
 
-      await createSpecies(payload, imageFile);
+      if (!submitKeyRef.current) {
+        submitKeyRef.current = createIdempotencyKey();
+      }
+      await createSpecies(payload, imageFile, submitKeyRef.current);
+      submitKeyRef.current = null;
 
       setStatus({
         type: "success",
@@ -183,6 +193,9 @@ function AddSpecies() {
       setForm(initialState);
       setImageFile(null);
     } catch (error) {
+      if (shouldResetIdempotencyKey(error)) {
+        submitKeyRef.current = null;
+      }
       setStatus({
         type: "error",
         message: error.message || "Unable to create species.",
@@ -1,6 +1,11 @@
 import { useEffect, useMemo, useState } from "react";
 import { Link } from "react-router-dom";
-import { fetchSpeciesList, resolveImageUrl } from "../api.js";
+import {
+  fetchSpeciesByIds,
+  fetchSpeciesList,
+  resolveImageUrl,
+  subscribeToSpeciesChanges,
+} from "../api.js";
 import { formatStatusLabel, getStatusClass } from "../status.js";
 import baseImage from "../../assets/base_fill.png";
 
@@ -36,6 +41,39 @@ function Directory() {
     };
   }, []);
 
+  // Patch the local list from change notices instead of reloading everything
+  useEffect(() => {
+    return subscribeToSpeciesChanges((change) => {
+      if (change.action === "resync") {
+        // Bypass the server's list cache, which may predate the missed changes
+        fetchSpeciesList({ fresh: 1 })
+          .then((data) => setSpeciesList(data))
+          .catch(() => {});
+        return;
+      }
+      if (change.action === "deleted") {
+        setSpeciesList((list) =>
+          list.filter((species) => species.species_id !== change.species_id)
+        );
+        return;
+      }
+      fetchSpeciesByIds([change.species_id])
+        .then(([updated]) => {
+          if (!updated) return;
+          setSpeciesList((list) => {
+            const exists = list.some(
+              (species) => species.species_id === updated.species_id
+            );
+            if (!exists) return [...list, updated];
+            return list.map((species) =>
+              species.species_id === updated.species_id ? updated : species
+            );
+          });
+        })
+        .catch(() => {});
+    });
+  }, []);
+
   const filteredList = useMemo(() => {
     const term = query.trim().toLowerCase();
     if (!term) return speciesList;
@@ -1,6 +1,11 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { Link, useParams } from "react-router-dom";
-import { fetchSpeciesById, updateSpecies } from "../api.js";
+import {
+  createIdempotencyKey,
+  fetchSpeciesById,
+  shouldResetIdempotencyKey,
+  updateSpecies,
+} from "../api.js";
 
 const initialState = {
   common_name: "",
@@ -32,6 +37,8 @@ function EditSpecies() {
   const [imageFile, setImageFile] = useState(null);
   const [status, setStatus] = useState({ type: "", message: "" });
   const [busy, setBusy] = useState(false);
+  // Shared by retries of the same submission so the server can deduplicate them
+  const submitKeyRef = useRef(null);
   const [loading, setLoading] = useState(true);
   const [originalImageUrl, setOriginalImageUrl] = useState("");
   const [originalAltText, setOriginalAltText] = useState("");
@@ -234,7 +241,11 @@ function EditSpecies() {
         payload.image_alt_text = form.image_alt_text.trim();
       }
 
-      await updateSpecies(id, payload, imageFile);
+      if (!submitKeyRef.current) {
+        submitKeyRef.current = createIdempotencyKey();
+      }
+      await updateSpecies(id, payload, imageFile, submitKeyRef.current);
+      submitKeyRef.current = null;
       setOriginalImageUrl(form.image_url.trim());
       setOriginalAltText(form.image_alt_text.trim());
       setImageFile(null);
@@ -243,6 +254,9 @@ function EditSpecies() {
         message: "Species updated successfully.",
       });
     } catch (error) {
+      if (shouldResetIdempotencyKey(error)) {
+        submitKeyRef.current = null;
+      }
       setStatus({
         type: "error",
         message: error.message || "Unable to update species.",